@@ -1,14 +1,62 @@
 # src/slack_notifier/notifier.py
 import os
+import atexit
+import functools
 import logging
 import socket
 import json
+import queue
+import threading
+import time
 
 from enum import Enum
 from datetime import datetime
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, List, Optional, Dict
 
-import requests
+# Prefer orjson (C implementation) for payload serialization when available
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
+# Environment is effectively constant for the life of the process, so resolve
+# it once at import instead of per-instance (see SlackNotifier.reset_env_cache)
+_ENV_WEBHOOK = os.getenv("SLACK_WEBHOOK_URL")
+_ENV_SYSTEM = os.getenv("SYSTEM_NAME")
+_ENV_PCTS = tuple(
+    sorted(int(x) for x in os.getenv("NOTIFICATION_PERCENTAGES", "20,100").split(","))
+)
+_HOSTNAME = socket.gethostname()
+
+# Slack rejects messages with more than 50 blocks
+_MAX_BLOCKS = 50
+
+
+def _mrkdwn_section(text: str) -> Dict:
+    """Build a Slack mrkdwn section block around the given text."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_code_block(s: str) -> tuple:
+    """Parse a JSON code-block string into (key, value) pairs.
+
+    Cached because callers tend to resend the same template string (e.g.
+    repeated progress or error notifications).
+    """
+    return tuple(_json_loads(s).items())
+
 
 class NotificationLogHandler(logging.FileHandler):
     """Custom handler for notification logs with special formatting"""
@@ -28,6 +76,20 @@ class NotificationLevel(Enum):
     DEBUG = "🔍"
 
 
+# Precomputed (emoji, name) pairs; enum attribute access goes through
+# descriptor machinery, so avoid repeating it on every notification
+_LEVEL_TEXT = {lvl: (lvl.value, lvl.name) for lvl in NotificationLevel}
+
+# NotificationLevel -> stdlib logging level (SUCCESS and INFO share info)
+_LEVEL_MAP = {
+    NotificationLevel.SUCCESS: logging.INFO,
+    NotificationLevel.WARNING: logging.WARNING,
+    NotificationLevel.ERROR: logging.ERROR,
+    NotificationLevel.INFO: logging.INFO,
+    NotificationLevel.DEBUG: logging.DEBUG,
+}
+
+
 class SlackNotifier:
     """
     notifier = SlackNotifier(
@@ -65,6 +127,28 @@ class SlackNotifier:
 
     """
 
+    # Shared session so TCP+TLS connections to hooks.slack.com are reused
+    # across notifications instead of a fresh handshake per post. Created on
+    # first send so importing this module doesn't pay for importing requests.
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    session.mount(
+                        "https://",
+                        HTTPAdapter(pool_connections=1, pool_maxsize=4),
+                    )
+                    cls._session = session
+        return cls._session
+
     def __init__(
         self,
         notification_log_path: str = None,
@@ -72,6 +156,8 @@ class SlackNotifier:
         total_files=0,
         start_time=datetime.now(),
         system_name: str = None,
+        batch_window: float = 0,
+        async_send: bool = False,
     ):
         """
         Initialize the Slack notifier with webhook URL and dedicated notification log.
@@ -80,38 +166,65 @@ class SlackNotifier:
             notification_log_path: Path to the notification log file
             webhook_url: Slack webhook URL. If not provided, will try to get from environment variable
             system_name: Name of the system sending notifications. If not provided, will try to get from environment variable
+            batch_window: Seconds to buffer notifications before posting them
+                as a single webhook call. 0 (default) sends synchronously.
+            async_send: If True, hand payloads to a background worker thread
+                so send_notification never blocks on network I/O. Messages
+                are dropped (and counted in self.dropped) if the queue fills.
         """
-        self.webhook_url = webhook_url or os.getenv("SLACK_WEBHOOK_URL")
+        self.webhook_url = webhook_url or _ENV_WEBHOOK
         self.use_logging = not bool(self.webhook_url)
-        self.system_name = system_name or os.getenv("SYSTEM_NAME", socket.gethostname())
+        self.system_name = system_name or _ENV_SYSTEM or _HOSTNAME
+        # Invariant part of the footer; only the timestamp changes per message
+        self._footer_prefix = f"System: {self.system_name} | Sent at: "
 
         # Set default notification log path if not provided
         self.notification_log_path = notification_log_path or "notifications.log"
-        self.webhook_url = webhook_url or os.getenv("SLACK_WEBHOOK_URL")
-        self.use_logging = not bool(self.webhook_url)
 
         # Create notification logger
         self.notification_logger = logging.getLogger("notifications")
         self.notification_logger.setLevel(logging.INFO)
         self.notification_logger.propagate = False  # Don't propagate to root logger
 
-        # Add notification handler
-        notification_handler = NotificationLogHandler(self.notification_log_path)
-        self.notification_logger.addHandler(notification_handler)
+        # Handler attached lazily on first log call so webhook-only
+        # instances never open (or even create) the notification log file
+        self._log_listener = None
 
-        # Get notification percentages from environment or use default
-        notification_pcts = os.getenv("NOTIFICATION_PERCENTAGES", "20,100")
-        self.notification_percentages = sorted(
-            [int(x) for x in notification_pcts.split(",")]
-        )
+        # Notification percentages come from the cached environment snapshot;
+        # the shared tuple is immutable, so no per-instance copy is needed
+        self.notification_percentages = _ENV_PCTS
         self.last_notification_pct = 0
+        self._next_pct_idx = 0  # cursor into notification_percentages
+
+        # Batching state: pending block lists waiting for the next flush
+        self.batch_window = batch_window
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        if self.batch_window > 0:
+            atexit.register(self.flush)
+
+        # Async state: bounded queue drained by a daemon worker thread
+        self.async_send = async_send
+        self.dropped = 0
+        self._queue = None
+        if self.async_send:
+            self._queue = queue.Queue(maxsize=1024)
+            worker = threading.Thread(target=self._send_worker, daemon=True)
+            worker.start()
 
         self.start_time = start_time
+        # Monotonic baseline for elapsed-time math, aligned with start_time
+        # so callers that pass an earlier start still get correct elapsed
+        self._start_monotonic = (
+            time.monotonic() - (datetime.now() - start_time).total_seconds()
+        )
         self.total_files = total_files
         self.processed_files = 0  # processed_files
         self.error_files = 0  # error_files
 
         if self.use_logging:
+            self._ensure_log_handler()
             self.notification_logger.info(
                 f"SlackNotifier initialized in logging-only mode (no webhook URL provided) for system: {self.system_name}"
             )
@@ -120,6 +233,52 @@ class SlackNotifier:
                 f"SlackNotifier initialized with webhook: {webhook_url} for system: {self.system_name}"
             )
 
+    def _ensure_log_handler(self):
+        """Attach the queue-backed file handler on first use.
+
+        Records flow through a queue to a listener thread that owns the
+        NotificationLogHandler, so callers only pay for an enqueue and
+        webhook-only instances never touch the log file at all.
+        """
+        if self._log_listener is not None:
+            return
+
+        # The "notifications" logger is a process-wide singleton; reuse a
+        # queue handler attached by an earlier instance instead of stacking
+        # another one that would write every record twice
+        for handler in self.notification_logger.handlers:
+            if isinstance(handler, QueueHandler):
+                self._log_listener = handler.listener
+                return
+
+        log_queue = queue.Queue(-1)
+        file_handler = NotificationLogHandler(self.notification_log_path)
+        self._log_listener = QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.listener = self._log_listener
+        self.notification_logger.addHandler(queue_handler)
+        atexit.register(self._log_listener.stop)
+
+    @classmethod
+    def reset_env_cache(cls):
+        """Re-read the cached environment variables.
+
+        The environment is snapshotted once at import time; call this if the
+        process mutates ``os.environ`` afterwards (mainly useful in tests).
+        """
+        global _ENV_WEBHOOK, _ENV_SYSTEM, _ENV_PCTS
+        _ENV_WEBHOOK = os.getenv("SLACK_WEBHOOK_URL")
+        _ENV_SYSTEM = os.getenv("SYSTEM_NAME")
+        _ENV_PCTS = tuple(
+            sorted(
+                int(x)
+                for x in os.getenv("NOTIFICATION_PERCENTAGES", "20,100").split(",")
+            )
+        )
+
     def _log_notification(
         self,
         level: NotificationLevel,
@@ -129,16 +288,24 @@ class SlackNotifier:
         fields_code_block: Optional[Dict[str, str]] = None,
     ):
         """Send notification to the dedicated notification log."""
-        full_message = []
+        # Skip all message formatting when the level is filtered out
+        lvl = _LEVEL_MAP[level]
+        if not self.notification_logger.isEnabledFor(lvl):
+            return
+
+        self._ensure_log_handler()
+        emoji, name = _LEVEL_TEXT[level]
+
+        headline = f"{emoji} {name}: {message}"
         if title:
-            full_message.append(f"=== {title} ===")
+            headline = f"=== {title} ===\n{headline}"
 
-        full_message.append(
-            f"{level.value} {level.name}: {message}"
-        )
-        # full_message.append(
-        #     f"[{self.system_name}] {level.value} {level.name}: {message}"
-        # )
+        # Fast path: most notifications carry no fields or code blocks
+        if not fields and not fields_code_block:
+            self.notification_logger.log(lvl, headline)
+            return
+
+        full_message = [headline]
 
         fields_str = self._format_fields_for_logging(fields)
         if fields_str:
@@ -150,15 +317,70 @@ class SlackNotifier:
 
         complete_message = "\n".join(full_message)
 
-        # Log to notification logger at appropriate level
-        if level == NotificationLevel.ERROR:
-            self.notification_logger.error(complete_message)
-        elif level == NotificationLevel.WARNING:
-            self.notification_logger.warning(complete_message)
-        elif level == NotificationLevel.DEBUG:
-            self.notification_logger.debug(complete_message)
-        else:  # SUCCESS and INFO go to info channel
-            self.notification_logger.info(complete_message)
+        self.notification_logger.log(lvl, complete_message)
+
+    def _create_simple_blocks(
+        self,
+        level: NotificationLevel,
+        message: str,
+        title: Optional[str] = None,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict]:
+        """Fast path for the common notification shape.
+
+        Handles the dominant case (no code blocks, at most 10 fields) without
+        the code-block and field-chunking branches of _create_message_blocks.
+        Produces identical output for those payloads.
+        """
+        blocks = []
+
+        if title:
+            blocks.append(
+                {
+                    "type": "header",
+                    "text": {"type": "plain_text", "text": f"{title}"},
+                }
+            )
+
+        emoji, name = _LEVEL_TEXT[level]
+        blocks.append(_mrkdwn_section(f"{emoji} *{name}*\n{message}"))
+
+        if fields:
+            blocks.append(
+                {
+                    "type": "section",
+                    "fields": [
+                        {
+                            "type": "mrkdwn",
+                            "text": f"*{key}:*\n"
+                            + (
+                                "\n".join(
+                                    f"• {k}: {v}" for k, v in value.items()
+                                )
+                                if isinstance(value, dict)
+                                else str(value)
+                            ),
+                        }
+                        for key, value in fields.items()
+                    ],
+                }
+            )
+
+        blocks.append(
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": self._footer_prefix
+                        + datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    }
+                ],
+            }
+        )
+
+        return blocks
+
     def _create_message_blocks(
         self,
         level: NotificationLevel,
@@ -192,79 +414,54 @@ class SlackNotifier:
             # )
             
         # Add main message block
-        blocks.append(
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"{level.value} *{level.name}*\n{message}",
-                },
-            }
-        )
+        emoji, name = _LEVEL_TEXT[level]
+        blocks.append(_mrkdwn_section(f"{emoji} *{name}*\n{message}"))
 
-        # Add fields if provided
+        # Add fields if provided (nested dicts become bulleted lists)
         if fields:
-            # Handle nested dictionaries in fields
-            formatted_fields = []
-            for key, value in fields.items():
-                if isinstance(value, dict):
-                    # Format nested dictionary as a bulleted list
-                    nested_items = [f"• {k}: {v}" for k, v in value.items()]
-                    field_value = "\n".join(nested_items)
-                else:
-                    field_value = str(value)
-
-                formatted_fields.append(
-                    {"type": "mrkdwn", "text": f"*{key}:*\n{field_value}"}
-                )
-
-            # Split fields into groups of 10 to avoid Slack's limit
-            field_groups = [
-                formatted_fields[i : i + 10]
-                for i in range(0, len(formatted_fields), 10)
+            formatted_fields = [
+                {
+                    "type": "mrkdwn",
+                    "text": f"*{key}:*\n"
+                    + (
+                        "\n".join(f"• {k}: {v}" for k, v in value.items())
+                        if isinstance(value, dict)
+                        else str(value)
+                    ),
+                }
+                for key, value in fields.items()
             ]
-            for group in field_groups:
-                blocks.append({"type": "section", "fields": group})
+
+            # Split fields into groups of 10 to avoid Slack's limit; the
+            # common <=10 case needs no slicing at all
+            if len(formatted_fields) <= 10:
+                blocks.append({"type": "section", "fields": formatted_fields})
+            else:
+                it = iter(formatted_fields)
+                while True:
+                    group = list(islice(it, 10))
+                    if not group:
+                        break
+                    blocks.append({"type": "section", "fields": group})
 
         # Add code block fields if provided
         if fields_code_block:
             if isinstance(fields_code_block, dict):
-                for key, value in fields_code_block.items():
-                    blocks.append(
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*{key}:*\n```{value}```",
-                            },
-                        }
-                    )
+                blocks.extend(
+                    _mrkdwn_section(f"*{key}:*\n```{value}```")
+                    for key, value in fields_code_block.items()
+                )
             else:
                 # handle `fields_code_block` string data type
                 try:
                     if isinstance(fields_code_block, str):
-                        fields_code_block = json.loads(fields_code_block)
-                        for key, value in fields_code_block.items():
-                            blocks.append(
-                                {
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": f"*{key}:*\n```{value}```",
-                                    },
-                                }
-                            )
+                        blocks.extend(
+                            _mrkdwn_section(f"*{key}:*\n```{value}```")
+                            for key, value in _parse_code_block(fields_code_block)
+                        )
                 except json.JSONDecodeError:
                     # If not valid JSON, treat as regular string
-                    blocks.append(
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"```{fields_code_block}```",
-                            },
-                        }
-                    )
+                    blocks.append(_mrkdwn_section(f"```{fields_code_block}```"))
 
         # Add timestamp and system context in footer
         blocks.append(
@@ -273,7 +470,8 @@ class SlackNotifier:
                 "elements": [
                     {
                         "type": "mrkdwn",
-                        "text": f"System: {self.system_name} | Sent at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                        "text": self._footer_prefix
+                        + datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     }
                 ],
             }
@@ -295,15 +493,12 @@ class SlackNotifier:
         if not fields:
             return ""
 
-        formatted = []
-        for key, value in fields.items():
-            if isinstance(value, dict):
-                nested = [f"    {k}: {v}" for k, v in value.items()]
-                formatted.append(f"{key}:\n" + "\n".join(nested))
-            else:
-                formatted.append(f"{key}: {value}")
-
-        return "\n" + "\n".join(formatted)
+        return "\n" + "\n".join(
+            f"{key}:\n" + "\n".join(f"    {k}: {v}" for k, v in value.items())
+            if isinstance(value, dict)
+            else f"{key}: {value}"
+            for key, value in fields.items()
+        )
 
     def _format_code_blocks_for_logging(
         self, fields_code_block: Optional[Dict[str, str]] = None
@@ -325,7 +520,7 @@ class SlackNotifier:
 
         return "\n" + "\n".join(formatted)
 
-    def _send_to_slack(self, blocks: List[Dict]) -> requests.Response:
+    def _send_to_slack(self, blocks: List[Dict]) -> "requests.Response":
         """Send formatted message blocks to Slack webhook.
 
         Args:
@@ -337,10 +532,11 @@ class SlackNotifier:
         Raises:
             requests.exceptions.RequestException: If the request fails
         """
-        return requests.post(
+        return self._get_session().post(
             self.webhook_url,
-            json={"blocks": blocks},
+            data=_json_dumps({"blocks": blocks}),
             headers={"Content-Type": "application/json"},
+            timeout=5,
         )
 
     def send_notification(
@@ -368,10 +564,35 @@ class SlackNotifier:
                 self._log_notification(level, message, title, fields, fields_code_block)
                 return True
 
-            # Create message blocks for Slack
-            blocks = self._create_message_blocks(
-                level, message, title, fields, fields_code_block
-            )
+            # Create message blocks for Slack (fast path for simple payloads)
+            if fields_code_block is None and (fields is None or len(fields) <= 10):
+                blocks = self._create_simple_blocks(level, message, title, fields)
+            else:
+                blocks = self._create_message_blocks(
+                    level, message, title, fields, fields_code_block
+                )
+
+            # In batched mode, buffer the blocks and let the timer flush them
+            if self.batch_window > 0:
+                with self._pending_lock:
+                    self._pending.append(blocks)
+                    if self._flush_timer is None:
+                        self._flush_timer = threading.Timer(
+                            self.batch_window, self.flush
+                        )
+                        self._flush_timer.daemon = True
+                        self._flush_timer.start()
+                return True
+
+            # In async mode, hand off to the worker; drop rather than block
+            # the caller if the queue is full
+            if self.async_send:
+                try:
+                    self._queue.put_nowait(blocks)
+                except queue.Full:
+                    self.dropped += 1
+                    return False
+                return True
 
             # Send to Slack
             response = self._send_to_slack(blocks)
@@ -386,6 +607,60 @@ class SlackNotifier:
                 logging.error(error_msg)
             return False
 
+    def _send_worker(self) -> None:
+        """Consume queued block lists and post them to Slack."""
+        while True:
+            blocks = self._queue.get()
+            try:
+                response = self._send_to_slack(blocks)
+                response.raise_for_status()
+            except Exception as e:
+                logging.error(f"Failed to send queued notification: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def close(self) -> None:
+        """Wait for queued notifications to drain and flush any batch."""
+        if self._queue is not None:
+            self._queue.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def flush(self) -> None:
+        """Send all buffered notifications as a single webhook post.
+
+        Pending block lists are merged with dividers between them and split
+        into multiple posts only when Slack's 50-block limit would be hit.
+        Called automatically by the batch timer and at interpreter exit.
+        """
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+        if not pending:
+            return
+
+        merged = []
+        for blocks in pending:
+            if merged:
+                merged.append({"type": "divider"})
+            merged.extend(blocks)
+
+        for i in range(0, len(merged), _MAX_BLOCKS):
+            try:
+                response = self._send_to_slack(merged[i : i + _MAX_BLOCKS])
+                response.raise_for_status()
+            except Exception as e:
+                logging.error(f"Failed to send batched notification: {str(e)}")
+
     def should_send_notification(self) -> bool:
         """
         Determine if a notification should be sent based on current progress.
@@ -393,16 +668,18 @@ class SlackNotifier:
         Returns:
             bool: True if notification should be sent, False otherwise
         """
-        if self.total_files == 0:
+        if self.total_files == 0 or self._next_pct_idx >= len(
+            self.notification_percentages
+        ):
             return False
 
-        current_pct = (self.processed_files / self.total_files) * 100
-
-        # Check if we've reached a new notification percentage
-        for notification_pct in self.notification_percentages:
-            if current_pct >= notification_pct > self.last_notification_pct:
-                self.last_notification_pct = notification_pct
-                return True
+        # Compare against the next unreached threshold only; the integer
+        # cross-multiply avoids a float division per processed file
+        target = self.notification_percentages[self._next_pct_idx]
+        if self.processed_files * 100 >= target * self.total_files:
+            self._next_pct_idx += 1
+            self.last_notification_pct = target
+            return True
 
         return False
 
@@ -419,9 +696,7 @@ class SlackNotifier:
         if not success:
             self.error_files += 1
 
-        elapsed_time = (
-            datetime.now() - self.start_time
-        ).total_seconds() / 3600  # hours
+        elapsed_time = (time.monotonic() - self._start_monotonic) / 3600  # hours
         processing_rate = self.processed_files / elapsed_time if elapsed_time > 0 else 0
         current_pct = self.processed_files / self.total_files * 100
 
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
@@ -11,8 +12,9 @@ class TestSlackNotifier(unittest.TestCase):
             webhook_url=self.webhook_url, system_name="TestSystem"
         )
 
-    @patch("requests.post")
-    def test_send_notification(self, mock_post):
+    @patch.object(SlackNotifier, "_session")
+    def test_send_notification(self, mock_session):
+        mock_post = mock_session.post
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_post.return_value = mock_response
@@ -24,6 +26,33 @@ class TestSlackNotifier(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
 
+    @patch.object(SlackNotifier, "_session")
+    def test_batched_notifications_flush_in_one_post(self, mock_session):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_session.post.return_value = mock_response
+
+        notifier = SlackNotifier(webhook_url=self.webhook_url, batch_window=60)
+        notifier.send_info("first")
+        notifier.send_info("second")
+        mock_session.post.assert_not_called()
+
+        notifier.flush()
+        mock_session.post.assert_called_once()
+        blocks = json.loads(mock_session.post.call_args.kwargs["data"])["blocks"]
+        self.assertIn({"type": "divider"}, blocks)
+
+    @patch.object(SlackNotifier, "_session")
+    def test_async_send_drains_queue_on_close(self, mock_session):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_session.post.return_value = mock_response
+
+        notifier = SlackNotifier(webhook_url=self.webhook_url, async_send=True)
+        self.assertTrue(notifier.send_info("queued message"))
+        notifier.close()
+        mock_session.post.assert_called_once()
+
     def test_should_send_notification(self):
         notifier = SlackNotifier(webhook_url=self.webhook_url, total_files=100)
         notifier.processed_files = 20  # 20%